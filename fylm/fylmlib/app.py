@@ -24,6 +24,7 @@ This module scans for and processes films.
     processor: the main class exported by this module.
 """
 
+from collections import deque
 from multiprocessing import Pool
 from timeit import default_timer as timer
 
@@ -41,7 +42,7 @@ from . import Film, FilmPath
 from .console import Tinta
 Info = FilmPath.Info
 
-QUEUE = []
+QUEUE: deque = deque()
 MOVED = []
 POOL: Pool = None
 
@@ -92,29 +93,29 @@ class App:
                      key=lambda f: f.title.lower())
 
         for film in NEW:
+            with Console.buffered():
+                if not film.exists():
+                    film.ignore_reason = IgnoreReason.DOES_NOT_EXIST
 
-            if not film.exists():
-                film.ignore_reason = IgnoreReason.DOES_NOT_EXIST
-
-            Console.film_header(film)
-            Console.film_src(film)
+                Console.film_header(film)
+                Console.film_src(film)
 
-            if config.interactive:
-                Interactive.lookup(film)
-                Interactive.handle_duplicates(film)
+                if config.interactive:
+                    Interactive.lookup(film)
+                    Interactive.handle_duplicates(film)
 
-            if film.should_ignore is True:
-                Console.skip(film)
-                continue
+                if film.should_ignore is True:
+                    Console.skip(film)
+                    continue
 
-            Duplicates.handle(film)
+                Duplicates.handle(film)
 
-            if not film.should_ignore:
-                QUEUE.append(film)
+                if not film.should_ignore:
+                    QUEUE.append(film)
 
-            if not Info.will_copy(film) or config.rename_only:
-                # Process the queue immediately
-                App.process_queue()
+                if config.rename_only or not Info.will_copy(film):
+                    # Process the queue immediately
+                    App.process_queue()
 
         # Process remaining queue items (or all, if copying)
         App.process_queue()
@@ -136,37 +137,42 @@ class App:
                          f"{ƒ.pluralize('film', len(QUEUE))}...").print()
 
         while len(QUEUE) > 0:
-            film = QUEUE.pop(0)
-            _, verbed, _ = Console.strings.verb(film)
-
-            if Info.will_copy(film):
-                Console.film_header(film)
-
-            if not film.exists():
-                Tinta().yellow(
-                    f"{INDENT}'No longer exists or cannot be accessed.").print()
-                continue
-
-            if film.src == film.dst:
-                Tinta(f'{INDENT}Already {verbed}').print()
-                continue
-
-            film.rename() if config.rename_only else film.move()
-
-            did_move = [f.did_move for f in film.files]
-
-            if all(did_move):
-                Tinta().dark_gray(f'{INDENT}{verbed.capitalize()}',
-                                  f'{ARROW} {film.dst}').print()
-                counter.add(len(did_move))
-
-                Duplicates.delete_upgraded()
-                if (config.remove_source
-                    and film.is_dir()
-                        and film.src != film.dst):
-                    Console.debug(f"Deleting parent folder '{film.src}'")
-                    Delete.dir(film.src, force=True)
-                MOVED.append(film)
+            with Console.buffered():
+                film = QUEUE.popleft()
+                _, verbed, _ = Console.strings.verb(film)
+
+                if Info.will_copy(film):
+                    Console.film_header(film)
+
+                if not film.exists():
+                    Tinta().yellow(
+                        f"{INDENT}'No longer exists or cannot be accessed.").print()
+                    continue
+
+                # Destination is derived from the film's name and resolution on
+                # every access, so only build it once per film.
+                dst = film.dst
+
+                if film.src == dst:
+                    Tinta(f'{INDENT}Already {verbed}').print()
+                    continue
+
+                film.rename() if config.rename_only else film.move(dst)
+
+                did_move = [f.did_move for f in film.files]
+
+                if all(did_move):
+                    Tinta().dark_gray(f'{INDENT}{verbed.capitalize()}',
+                                      f'{ARROW} {dst}').print()
+                    counter.add(len(did_move))
+
+                    Duplicates.delete_upgraded()
+                    if (config.remove_source
+                        and film.is_dir()
+                            and film.src != dst):
+                        Console.debug(f"Deleting parent folder '{film.src}'")
+                        Delete.dir(film.src, force=True)
+                    MOVED.append(film)
 
     @staticmethod
     def end():
@@ -24,6 +24,7 @@ during runtime.
 """
 
 import re
+from functools import lru_cache
 from typing import Tuple
 
 from rapidfuzz import fuzz
@@ -36,6 +37,22 @@ from .constants import *
 
 class Compare:
 
+    @staticmethod
+    # A parsed title is compared with every TMDb result found for it, so keep
+    # the most recently normalized titles rather than normalizing it each time.
+    @lru_cache(maxsize=1024)
+    def normalize_title(s: str) -> str:
+        """Normalize a title for comparison, stripping unwanted chars and
+        converting to lowercase.
+
+        Args:
+            s: (str, utf-8) the title to normalize.
+        Returns:
+            The normalized title, with words separated by single spaces.
+        """
+        return ' '.join(
+            patterns.STRIP_WHEN_COMPARING.sub(' ', s).lower().split())
+
     @staticmethod
     def title_similarity(a, b):
         """Compare parsed title to TMDb title.
@@ -52,9 +69,8 @@ class Compare:
         # (mixed case, missing symbols, or illegal OS chars), we strip unwanted chars from
         # both the original and TMDb title, and convert both to lowercase so we can get
         # a more accurate string comparison.
-        a = ' '.join(re.sub(patterns.STRIP_WHEN_COMPARING, ' ', a).lower().split())
-        b = ' '.join(re.sub(patterns.STRIP_WHEN_COMPARING, ' ', b or '').lower().split())
-        return fuzz.token_sort_ratio(a, b) / 100
+        return fuzz.token_sort_ratio(Compare.normalize_title(a),
+                                     Compare.normalize_title(b or '')) / 100
 
     @staticmethod
     def year_deviation(year, proposed_year) -> int:
@@ -40,6 +40,7 @@ import time
 from pathlib import Path
 from datetime import datetime
 from typing import List, Tuple
+from contextlib import contextmanager
 
 from colors import color
 from tinta import Tinta
@@ -299,12 +300,38 @@ class Console():
         if choice.startswith('['):
             c.dark_gray(f'{choice}')
         else:
-            match = re.search(patterns.TMDB_ID, choice)
-            tmdb_id = match.group('tmdb_id') if match else ''
-            c.light_gray(f"{re.sub(patterns.TMDB_ID, '', choice)}")
+            # Split the trailing TMDb ID out of the choice in a single scan.
+            match = patterns.TMDB_ID.search(choice)
+            if match:
+                (choice, tmdb_id) = (choice[:match.start()] + choice[match.end():],
+                                     match.group('tmdb_id'))
+            else:
+                tmdb_id = ''
+            c.light_gray(choice)
             c.dark_gray(tmdb_id)
         c.print()
 
+    @staticmethod
+    @contextmanager
+    def buffered():
+        """Holds console output until the block exits, then flushes it all
+        at once, instead of writing every line to the terminal as it is
+        printed. Explicit flushes (e.g. the copy progress bar) still write
+        immediately. Output isn't held in interactive mode, where the user
+        needs to see each prompt, or when already buffering.
+        """
+        stdout = sys.stdout
+        if config.interactive or not getattr(stdout, 'line_buffering', False):
+            yield
+            return
+
+        stdout.reconfigure(line_buffering=False)
+        try:
+            yield
+        finally:
+            stdout.flush()
+            stdout.reconfigure(line_buffering=True)
+
     @staticmethod
     def copy_progress_bar(copied, total):
         """Print progress bar to terminal.
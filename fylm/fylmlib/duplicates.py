@@ -28,6 +28,8 @@ import sys
 
 import nest_asyncio
 
+from lazy import lazy
+
 from .enums import *
 from .tools import *
 import fylmlib.config as config
@@ -59,6 +61,7 @@ class Duplicates:
         if not config.duplicates.enabled or config.rename_only:
             Console.debug('Duplicate checking is disabled, skipping.')
             self.films = []
+            return
 
         Console.debug(
             f"Looking for duplicates of '{self.src.title} ({self.src.year})'")
@@ -81,7 +84,7 @@ class Duplicates:
     def __len__(self):
         return len(self.films)
 
-    @property
+    @lazy
     def files(self) -> List['Film.File']:
         """Retrieves a list of duplicate files in all dst paths.
         Returns:
@@ -143,13 +146,18 @@ class Duplicates:
         if film.should_ignore:
             return False
 
-        # Return immediately if the film is not a duplicate,
-        # or if duplicates off, or rename on.
-        if (len(film.duplicates) == 0
-            or config.rename_only
+        # Return immediately if duplicates off, or rename on,
+        # or if the film is not a duplicate.
+        if (config.rename_only
             or not config.duplicates.enabled):
             return True
 
+        # Searching for duplicates globs every dst dir, so search once, and
+        # only search again if some of them have been renamed.
+        duplicates = film.duplicates
+        if len(duplicates) == 0:
+            return True
+
         move = []
         existing_to_delete = []
 
@@ -157,7 +165,7 @@ class Duplicates:
         # we need to process each separately.
         for v in film.video_files:
 
-            mp = film.duplicates.map(v)
+            mp = duplicates.map(v)
             Console.duplicates(v, mp)
 
             exact = first(mp, where=lambda d: v.dst == d.duplicate.src, default=None)
@@ -177,6 +185,10 @@ class Duplicates:
                 existing_to_delete.extend(upgradable)
 
             Duplicates.rename_upgradable(list(set(existing_to_delete)))
+            # Upgradable duplicates were renamed out of the way, so search
+            # again before mapping the next file.
+            if existing_to_delete:
+                duplicates = film.duplicates
             move.append(v)
 
         if len(move) == 0:
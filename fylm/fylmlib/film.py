@@ -39,6 +39,7 @@ from timeit import default_timer as timer
 USE_MEDIA_INFO = os.environ.get('CI') is None
 if USE_MEDIA_INFO:
     from pymediainfo import MediaInfo
+    MEDIA_INFO_LIB = str(Path(__file__).resolve().parent / 'libmediainfo.0.dylib')
 
 from lazy import lazy
 import nest_asyncio
@@ -60,6 +61,16 @@ Info = FilmPath.Info
 if TYPE_CHECKING:
     from pymediainfo import Track
 
+# Map of video track widths to resolutions, used when the resolution
+# can't be parsed from the filename.
+RESOLUTION_BY_WIDTH = {
+    3840: Resolution.UHD_2160P,
+    1920: Resolution.HD_1080P,
+    1280: Resolution.HD_720P,
+    1024: Resolution.SD_576P,
+    852: Resolution.SD_480P
+}
+
 class Film(FilmPath):
     """A Film object contains basic details about the a film, references to the individual
     File objects it contains (or just one, if it's a single file). Using regular expressions
@@ -195,7 +206,7 @@ class Film(FilmPath):
         success = all([f.did_move for f in self.files])
         if success:
             self.did_move = True
-            self.setpath(Path(dst))
+            self.setpath(dst)
         return self
 
     def rename(self) -> 'Film':
@@ -417,9 +428,9 @@ class Film(FilmPath):
             assert self.film.new_name
             assert self.new_name
             res_key = self.resolution
-            if (iterlen(self.film.video_files) > 1
+            if (res_key == Resolution.UNKNOWN
                 and self != self.film.main_file
-                and self.resolution == Resolution.UNKNOWN):
+                and iterlen(self.film.video_files) > 1):
                 res_key = self.film.main_file.resolution
             root = (config.destination_dir(res_key)
                     if not config.rename_only
@@ -462,7 +473,7 @@ class Film(FilmPath):
 
         @lazy
         def is_subtitle(self):
-            return self.suffix.lower() in constants.SUB_EXTS
+            return Subtitle.is_subtitle(self)
 
         @lazy
         def is_wanted(self):
@@ -487,8 +498,7 @@ class Film(FilmPath):
                 return None
 
             try:
-                media_info = MediaInfo.parse(str(self), library_file=str(
-                    Path(__file__).resolve().parent / 'libmediainfo.0.dylib'))
+                media_info = MediaInfo.parse(str(self), library_file=MEDIA_INFO_LIB)
 
                 for track in media_info.tracks:
                     if track.track_type == 'Video':
@@ -508,32 +518,36 @@ class Film(FilmPath):
             dst = dst or self.dst
             self.did_move = IO.move(self.src, dst)
             if self.did_move:
-                self.setpath(Path(dst))
+                self.setpath(dst)
             return self
 
         @lazy
         def new_name(self) -> Path:
             name = Format.Name(self)
             base = f'{name.filename}{self.suffix}'
-
-            def clean(extras): return ' ' + re.sub(r'\W+', ' ', extras).strip().capitalize()
-            def name_with_extras(extras):
-                return f"{Format.Name(self.film.main_file).filename}{extras}{self.suffix}"
-
-            main_file_stem = self.film.main_file.src.stem.lower()
-            this_file_stem = self.src.stem.lower()
+            main_file = self.film.main_file
 
             # It's the main file, just use the base name
-            if self == self.film.main_file:
+            if self == main_file:
                 return base
 
             # It's a subtitle
-            elif self.is_subtitle:
+            if self.is_subtitle:
                 return Subtitle(self).path_with_lang(base)
 
             # There are more than one video file, we need to
             # rename them to something unique.
-            elif (iterlen(self.film.video_files) > 1):
+            video_files = list(self.film.video_files)
+            if len(video_files) > 1:
+
+                # Only build the main file's name once, it's shared by all extras.
+                main_filename = Format.Name(main_file).filename
+
+                def clean(extras): return ' ' + re.sub(r'\W+', ' ', extras).strip().capitalize()
+                def name_with_extras(extras): return f"{main_filename}{extras}{self.suffix}"
+
+                main_file_stem = main_file.src.stem.lower()
+                this_file_stem = self.src.stem.lower()
 
                 # The extra file includes the main file's name, append the difference.
                 if main_file_stem in this_file_stem:
@@ -543,14 +557,14 @@ class Film(FilmPath):
                 # This file is a different quality than the main file, and has a year
                 # so it's likely a video file of a different quality.
                 elif (Parser(self.name).year and Compare.quality(
-                    self, self.film.main_file)[0] != ComparisonResult.EQUAL):
+                    self, main_file)[0] != ComparisonResult.EQUAL):
                     return base
 
                 # if neither of those work, try and append original file's name,
                 # or the number this file's index in self.film.video_files.
                 else:
 
-                    idx = list(self.film.video_files).index(self)
+                    idx = video_files.index(self)
                     appended = name_with_extras(clean(self.stem))
                     if not Path(appended).exists():
                         return appended
@@ -579,11 +593,8 @@ class Film(FilmPath):
                 return res
             elif self.mediainfo:
                 try:
-                    if self.mediainfo.width == 3840: return Resolution.UHD_2160P
-                    elif self.mediainfo.width == 1920: return Resolution.HD_1080P
-                    elif self.mediainfo.width == 1280: return Resolution.HD_720P
-                    elif self.mediainfo.width == 1024: return Resolution.SD_576P
-                    elif self.mediainfo.width == 852: return Resolution.SD_480P
+                    return RESOLUTION_BY_WIDTH.get(
+                        self.mediainfo.width, Resolution.UNKNOWN)
                 except:
                     pass
             return Resolution.UNKNOWN
@@ -45,6 +45,12 @@ if TYPE_CHECKING:
 
 MAX_WORKERS = 50
 
+# Compiled expressions for the template keys in rename patterns, keyed by
+# template key. Each regular expression matches `{<anything>key<anything>}`,
+# except where { } are escaped with backslashes, and is compiled the first time
+# its key is used, rather than for every name that is built.
+TEMPLATE_KEYS = {}
+
 class Format:
 
     # FIXME: Format should take a string or int and init
@@ -152,14 +158,16 @@ class Format:
             # Enumerate the pattern map
             for key, value in pattern_map:
 
-                # Generate a regular expression that suppports the keyword inside { }
-                # and uses capture groups to preserve additional formatting characters.
-                # The expression matches `{<anything>key<anything>}`, except where
-                # { } are escaped with backslashes, i.e. \{ and \}.
-                rx = re.compile(r'\{([^\{]*)' + key + r'([^\}]*)\}', re.I)
+                # Look up the compiled expression that suppports the keyword
+                # inside { } and uses capture groups to preserve additional
+                # formatting characters.
+                rx = TEMPLATE_KEYS.get(key)
+                if rx is None:
+                    rx = re.compile(r'\{([^\{]*)' + key + r'([^\}]*)\}', re.I)
+                    TEMPLATE_KEYS[key] = rx
 
                 # Check for a match
-                match = re.search(rx, template)
+                match = rx.search(template)
 
                 # Replace the template key in the pattern and strip the surrounding { }.
                 # We add capture groups back in here to preserve extraneous chars that were
@@ -171,7 +179,7 @@ class Format:
 
                 # Update the template by replacing the original template match (e.g. `{title}`)
                 # with the replacement (e.g. `Furngully The Last Rainforest`).
-                template = re.sub(rx, str(replacement)
+                template = rx.sub(str(replacement)
                                   if value is not None else '', template)
 
             # Convert escaped template characters to un-escaped plain { }.
@@ -304,7 +312,7 @@ class Format:
         Returns:
             A string without `The` at the beginning or end.
         """
-        return re.sub(patterns.THE_PREFIX_SUFFIX, '', s)
+        return patterns.THE_PREFIX_SUFFIX.sub('', s)
 
     @staticmethod
     def strip_illegal_chars(s):
@@ -103,7 +103,10 @@ class Interactive:
         # we need to process each separately.
         for v in film.video_files:
 
-            mp = film.duplicates.map(v)
+            # Duplicates may have been renamed by a previous choice, so
+            # search once per file and reuse the result.
+            duplicates = film.duplicates
+            mp = duplicates.map(v)
             Console.duplicates(v, mp)
 
             choices = []
@@ -138,11 +141,11 @@ class Interactive:
                                     "Upgrade existing lower quality version"))
 
             if len(keep_both) > 0:
-                choices.append(f"Keep this file (and existing {ƒ.pluralize('version', len(film.duplicates.files))})")
+                choices.append(f"Keep this file (and existing {ƒ.pluralize('version', len(duplicates.files))})")
             elif len(keep_existing) > 0 and not exact:
                 choices.append(f"Keep this file anyway")
 
-            choices.extend([f"Delete this file (keep existing {ƒ.pluralize('version', len(film.duplicates.files))})",
+            choices.extend([f"Delete this file (keep existing {ƒ.pluralize('version', len(duplicates.files))})",
                             ('S', '[ Skip ]')])
 
             (choice, letter) = cls._choice_input(
@@ -49,7 +49,9 @@ class Languages:
 
         def __init__(self, code, names):
             self.code = code
-            self.names = [n.strip() for n in names.split(',')]
+            # Drop any blank names up front, so they aren't filtered by
+            # every consumer.
+            self.names = tuple(filter(None, (n.strip() for n in names.split(','))))
             self.primary_name = self.names[0]
 
         def __repr__(self):
@@ -30,8 +30,12 @@ import datetime
 
 import fylmlib.config as config
 
-logging.getLogger("urllib3").setLevel(logging.CRITICAL)
-logging.getLogger("urllib3").propagate = False
+# Keep the HTTP libraries used for TMDb searches out of the log. This is set
+# once here rather than by toggling logging around each request, since
+# searches run concurrently in worker threads.
+for name in ("urllib3", "requests_cache"):
+    logging.getLogger(name).setLevel(logging.CRITICAL)
+    logging.getLogger(name).propagate = False
 
 # Set date output format
 NOW = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
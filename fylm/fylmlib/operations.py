@@ -27,8 +27,10 @@ get, move, rename, and delete. Also includes filesize detector methods.
     size: file and dir size calculator
 """
 
+import errno
 import os
 import shutil
+import stat
 import sys
 import re
 import itertools
@@ -36,7 +38,7 @@ import time
 import asyncio
 import multiprocessing
 from pathlib import Path
-from typing import List, Union, Iterable
+from typing import List, Tuple, Union, Iterable
 
 import fylmlib.config as config
 import fylmlib.patterns as patterns
@@ -109,12 +111,12 @@ class Delete:
         if max_size == -1:
             force = True
 
-        # Get count of files
-        files_count = len([f.is_file() for f in Find.deep(path)])
+        # Get count of files and the dir's size in a single pass
+        files_count, size = Size.scan(path)
 
         # First we ensure the dir is less than the max_size threshold, or empty,
         # otherwise abort. If max_size is -1 or force is enabled, do it anyway.
-        if files_count == 0 or force or Size(path).value < max_size:
+        if files_count == 0 or force or size < max_size:
 
             Console.debug(f"Recursively deleting '{path}' which contains {files_count} file(s).")
 
@@ -195,13 +197,16 @@ class Delete:
 
         try:
             p = Path(path)
-            if not p.exists():
-                Console.error(f"{INDENT}Could not delete '{p}'; it does not exist.")
-            else:
-                if not config.test:
-                    p.unlink()
-                # If successful, return 1 for a successful op.
-                return 1
+            # Unlink straight away rather than checking that it exists first,
+            # it fails the same way and saves a stat per file.
+            if not config.test:
+                p.unlink()
+            elif not p.exists():
+                raise FileNotFoundError(p)
+            # If successful, return 1 for a successful op.
+            return 1
+        except FileNotFoundError:
+            Console.error(f"{INDENT}Could not delete '{p}'; it does not exist.")
         except Exception as e:
             Console.error(f"{INDENT}Unable to remove '{path}': {e}")
 
@@ -536,7 +541,7 @@ class IO:
         Console.debug(  f"      To: '{dst}'\n")
 
         # Check if a file already exists with the same name as the one we're moving.
-        # By default, abort here (otherwise shutil.move would silently overwrite it)
+        # By default, abort here (otherwise the move would silently overwrite it)
         # and print a warning to the console. If force_overwrite is enabled,
         # proceed anyway, otherwise forcibly prevent accidentally overwriting files.
         # If we determined it's OK to upgrade the detination, we can skip this.
@@ -559,13 +564,13 @@ class IO:
             time.sleep(0.05)
             return True
 
-        # Store the size of the source file to verify the copy was successful.
-        expected_size = Size(src).value
-
         # Do we need to copy, or move?
         copy = config.always_copy is True or not FilmPath.Info.is_same_partition(
             src, dst)
 
+        # Store the size of the source file to verify the copy was successful.
+        expected_size = Size(src).value if copy else None
+
         # Generate a new filename using .partial~ to indicate the file
         # has not be completely copied.
         dst_tmp = dst.parent / f'{dst.name}.partial~'
@@ -579,17 +584,26 @@ class IO:
             if dst.exists():
                 dst.rename(dst_dup)
 
-            # If copy is enabled, or if partition is not the same, copy with
-            # progress bar instead.
-            if copy:
-
-                # Copy the file using progress bar
-                IO.copy_with_progress(src, dst_tmp)
-
-            # Just move
-            else:
-                # Otherwise, move the file instead.
-                shutil.move(src, dst_tmp)
+            # If partition is the same, a rename is atomic, so there's no
+            # partial state to protect and no need to verify the size. Move
+            # straight to dst in a single rename.
+            if not copy:
+                try:
+                    os.rename(src, dst)
+                except OSError as e:
+                    # Some mounts (bind, overlay, network) share a device id
+                    # but can't rename across each other, so copy instead.
+                    if e.errno != errno.EXDEV:
+                        raise
+                    expected_size = Size(src).value
+                else:
+                    if dst_dup.exists():
+                        Delete.file(dst_dup)
+
+                    return True
+
+            # Copy the file using progress bar
+            IO.copy_with_progress(src, dst_tmp)
 
             # Make sure the new file exists on the filesystem.
             if not dst_tmp.exists():
@@ -834,12 +848,47 @@ class Size:
         if not isinstance(self, Size):
             raise AttributeError("'_calc' was called before Size was initialized.")
 
-        # If it's a directory, we need to call the _size_dir func to recursively get
+        # If it's a directory, we need to scan it to recursively get
         # the size of each file inside.
-        if self.path.is_dir():
-            return sum(f.stat().st_size for f in self.path.glob('**/*') if f.is_file())
+        st = self.path.stat()
+        if stat.S_ISDIR(st.st_mode):
+            return Size.scan(self.path)[1]
         else:
-            return self.path.stat().st_size
+            return st.st_size
+
+    @staticmethod
+    def scan(path: Union[str, Path, 'FilmPath']) -> Tuple[int, int]:
+        """Recursively scan a dir using os.scandir, which reuses the file type
+        returned by the dir listing, so only files need to be stat'd.
+
+        Args:
+            path (str, Path, or FilmPath): Dir to scan.
+
+        Returns:
+            Tuple[int, int]: Number of files and dirs found (excluding system
+                             files), and the total size of all files in bytes.
+        """
+        count = 0
+        size = 0
+        # Like os.walk, skip dirs that can't be read or no longer exist.
+        try:
+            it = os.scandir(path)
+        except OSError:
+            return (count, size)
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        (c, s) = Size.scan(entry.path)
+                        count += c + 1
+                        size += s
+                    elif entry.is_file():
+                        size += entry.stat().st_size
+                        count += 0 if is_sys_file(entry.name) else 1
+                except OSError:
+                    # The file was removed while scanning.
+                    continue
+        return (count, size)
 
     def refresh(self) -> int:
         self._size = None
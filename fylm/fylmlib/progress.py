@@ -27,6 +27,51 @@ This module generates a progress bar from a percentage and width.
 from colors import color
 import fylmlib.config as config
 
+# Glyphs and the colors to paint them with, keyed by plaintext mode. These
+# can't be built at import time because the console module (which imports
+# this one) loads the colors, so they are built on first use and reused for
+# every subsequent bar.
+GLYPHS = {}
+
+# Widths of the blocks widget and percent per block, keyed by bar width.
+WIDTHS = {}
+
+# Rendered blocks widgets, keyed by plaintext mode, width, number of full
+# blocks, and gradient index. The widget only changes when a block (or its
+# gradient) changes, so most calls during a copy reuse an existing one.
+BLOCKS = {}
+
+# Progress bar is block_widget separator perc_widget : ####### 30%
+MAX_PERC_WIDGET = '100%'  # 100% is max
+SEPARATOR = ' '
+
+# Epsilon is the sensitivity of rendering a gradient block.
+EPSILON = 1e-6
+
+def _glyphs():
+    """Returns the full block and incomplete gradient glyphs for the current
+    plaintext mode, and the colors for complete and incomplete blocks (None
+    in plaintext), building and caching them on first use."""
+
+    glyphs = GLYPHS.get(config.plaintext)
+    if glyphs:
+        return glyphs
+
+    if config.plaintext:
+        glyphs = ("X", ["-", "-", "="], None, None)
+    else:
+        from .console import Tinta
+        glyphs = ('█', ['░', '▒', '▓'],
+                  Tinta.colors.pink, Tinta.colors.dark_gray)
+
+    GLYPHS[config.plaintext] = glyphs
+    return glyphs
+
+def _paint(s, fg):
+    """Colors a run of blocks with a single escape sequence, rather than
+    one per block."""
+    return color(s, fg=fg) if s and fg else s
+
 class Progress:
 
     def bar(percentage, width=50):
@@ -39,57 +84,57 @@ class Progress:
             A compiled progress bar for outputting to console.
         """
 
-        from .console import Tinta
+        (FULL_BLOCK, INCOMPLETE_BLOCK_GRAD, full_color, empty_color) = _glyphs()
 
-        if config.plaintext:
-            FULL_BLOCK = "X"
-            INCOMPLETE_BLOCK_GRAD = ["-", "-", "="]
-        else:
-            FULL_BLOCK = color('█', fg=Tinta.colors.pink)
-            INCOMPLETE_BLOCK_GRAD = [color('░', fg=Tinta.colors.dark_gray),
-                                     color('▒', fg=Tinta.colors.dark_gray),
-                                     color('▓', fg=Tinta.colors.dark_gray)]
-
-        assert(isinstance(percentage, float) or isinstance(percentage, int))
-        assert(0. <= percentage <= 100.)
-        # progress bar is block_widget separator perc_widget : ####### 30%
-        max_perc_widget = '100%' # 100% is max
-        separator = ' '
-        blocks_widget_width = width - len(separator) - len(max_perc_widget)
-        assert(blocks_widget_width >= 10) # not very meaningful if not
-        perc_per_block = 100.0/blocks_widget_width
-
-        # Epsilon is the sensitivity of rendering a gradient block.
-        epsilon = 1e-6
+        # Clamp rather than assert, since this is called for every chunk
+        # during a copy.
+        percentage = (0.0 if percentage < 0
+                      else 100.0 if percentage > 100
+                      else float(percentage))
+
+        try:
+            (blocks_widget_width, perc_per_block) = WIDTHS[width]
+        except KeyError:
+            # Only validate the width the first time it is seen.
+            blocks_widget_width = width - len(SEPARATOR) - len(MAX_PERC_WIDGET)
+            if blocks_widget_width < 10: # not very meaningful if not
+                raise ValueError(f'Progress bar width {width} is too narrow')
+            perc_per_block = 100.0/blocks_widget_width
+            WIDTHS[width] = (blocks_widget_width, perc_per_block)
 
         # Number of blocks that should be represented as complete.
-        full_blocks = int((percentage + epsilon)/perc_per_block)
+        full_blocks = int((percentage + EPSILON)/perc_per_block)
 
         # The rest are incomplete.
         empty_blocks = blocks_widget_width - full_blocks
 
-        # Build blocks widget.
-        blocks_widget = ([FULL_BLOCK] * full_blocks)
-        blocks_widget.extend([INCOMPLETE_BLOCK_GRAD[0]] * empty_blocks)
-
         # Calculate remainder due to how granular our blocks are.
         remainder = percentage - full_blocks * perc_per_block
 
         # Epsilon needed for rounding errors (check would be != 0.)
         # based on reminder modify first empty block shading, depending
         # on remainder.
-        if remainder > epsilon:
+        grad_index = None
+        if remainder > EPSILON and empty_blocks > 0:
             grad_index = int((len(INCOMPLETE_BLOCK_GRAD) * remainder)/perc_per_block)
-            blocks_widget[full_blocks] = INCOMPLETE_BLOCK_GRAD[grad_index]
+
+        key = (config.plaintext, width, full_blocks, grad_index)
+        blocks_widget = BLOCKS.get(key)
+        if blocks_widget is None:
+            if grad_index is not None:
+                incomplete = (INCOMPLETE_BLOCK_GRAD[grad_index]
+                              + INCOMPLETE_BLOCK_GRAD[0] * (empty_blocks - 1))
+            else:
+                incomplete = INCOMPLETE_BLOCK_GRAD[0] * empty_blocks
+            blocks_widget = (_paint(FULL_BLOCK * full_blocks, full_color)
+                             + _paint(incomplete, empty_color))
+            BLOCKS[key] = blocks_widget
 
         # Build percentage widget
         str_perc = f'{percentage:.1f}'
 
         # Subtract 1 because the percentage sign is not included.
-        perc_widget = f'{str_perc.ljust(len(max_perc_widget) - 3)}%'
-
-        # Generate progress bar
-        progress_bar = f"{''.join(blocks_widget)}{separator}{perc_widget}"
+        perc_widget = f'{str_perc.ljust(len(MAX_PERC_WIDGET) - 3)}%'
 
         # Return the progress bar as string.
-        return ''.join(progress_bar)
+        return f"{blocks_widget}{SEPARATOR}{perc_widget}"
@@ -32,6 +32,7 @@ Sample subtitle filenames:
     ...etc.
 """
 
+import os
 import re
 from pathlib import Path
 from typing import Union
@@ -45,6 +46,71 @@ if TYPE_CHECKING:
 
 _LANGUAGES = Languages().load()
 
+# Tuple of subtitle extensions, so they can be checked with str.endswith.
+_SUB_EXTS = tuple(constants.SUB_EXTS)
+
+def _needles():
+    """Yields the language strings and codes to search for, paired with their
+    language. Order matters: the first language (and the first of its strings)
+    that appears in the name wins, so a string that repeats an earlier one
+    (e.g. a shared three letter prefix) could never match, and is skipped.
+    """
+    seen = set()
+    for lang in _LANGUAGES:
+        for s in [lang.code] + [x for n in lang.names for x in (n, n[:3])]:
+            if s.lower() not in seen:
+                seen.add(s.lower())
+                yield (lang, s)
+
+_NEEDLES = list(_needles())
+
+def _fuse(needles):
+    """Fuses needles into a single case insensitive alternation, each in its
+    own group, so that the name is scanned once instead of once per needle.
+
+    The alternation is wrapped in a lookahead so that finditer tries every
+    word boundary in the name, and alternatives are bucketed by their first
+    character so that only plausible needles are tried at each position.
+    Within a bucket, needles keep their priority order.
+
+    Returns:
+        A compiled regex, and a list mapping each group to its needle's index.
+    """
+    buckets = {}
+    for (i, (_, s)) in enumerate(needles):
+        buckets.setdefault(s[:1].lower(), []).append(i)
+
+    groups = []
+    alts = []
+    for (c, idxs) in buckets.items():
+        groups.extend(idxs)
+        alts.append('(?=' + re.escape(c) + ')(?:' + '|'.join(
+            '(' + re.escape(needles[i][1]) + r'(?:-\w{2})?)\b' for i in idxs) + ')')
+    return (re.compile(r'\b(?=' + '|'.join(alts) + ')', re.I), groups)
+
+(_LANG_RE, _GROUPS) = _fuse(_NEEDLES)
+
+_WORD = re.compile(r'\w+')
+
+def _first_words(needles):
+    """Returns the casefolded first word of every needle. A needle can only
+    match where a word in the name equals its first word, so a name with
+    none of these words can't match any needle, and needn't be scanned.
+
+    Returns:
+        A frozenset of words, or None if a needle doesn't start with a word
+        character (in which case every name must be scanned).
+    """
+    words = set()
+    for (_, s) in needles:
+        m = _WORD.match(s)
+        if not m:
+            return None
+        words.add(m.group().casefold())
+    return frozenset(words)
+
+_FIRST_WORDS = _first_words(_NEEDLES)
+
 class Subtitle:
     """A subtitle object that contains information about its language.
 
@@ -53,9 +119,8 @@ class Subtitle:
     """
     def __init__(self, path):
 
-        if not Path(path).suffix.lower() in constants.SUB_EXTS:
-            from fylm.fylmlib.constants import INDENT
-            Console.error(f"{INDENT}'{path}' is not a valid subtitle file")
+        if not Subtitle.is_subtitle(path):
+            Console.error(f"{constants.INDENT}'{path}' is not a valid subtitle file")
             return
 
         # Path to original subtitle file.
@@ -70,40 +135,42 @@ class Subtitle:
         # The language string captured from the original filename, e.g. 'english' or 'en'.
         self.captured = None
 
-        def pattern(s):
-            return re.compile(r'\b(?P<lang>' + re.escape(s) + r'(?:-\w{2})?)\b', re.I)
+        # Only the file's name is searched, so get it once. This works
+        # whether path is a str or a Path.
+        name = os.path.basename(path)
 
-        # First we loop through languages to determine if the path contains
-        # a descriptive language string, e.g. 'english', 'dutch', or 'fr'
-        for lang in _LANGUAGES:
-
-            patterns = []
-
-            # Compile patterns that matches language strings and codes, case insensitive.
-            patterns.append(pattern(lang.code))
-            for n in list(filter(None, lang.names)):
-                patterns.append(pattern(n))
-                patterns.append(pattern(n[:3]))
+        # Most names don't contain a language at all, so check their words
+        # against the needles' first words before scanning.
+        if _FIRST_WORDS is not None and _FIRST_WORDS.isdisjoint(
+                w.casefold() for w in _WORD.findall(name)):
+            return
 
-            # Iterate the array of patterns that we want to check for.
-            for p in patterns:
+        # Determine if the path contains a descriptive language string,
+        # e.g. 'english', 'dutch', or 'fr'. Of all the matches, keep the
+        # first with the highest priority.
+        match = min(_LANG_RE.finditer(name),
+                    key=lambda m: _GROUPS[m.lastindex - 1], default=None)
+        if match:
 
-                # Search for rx match.
-                match = re.search(p, self.path.name)
-                if match and match.group('lang'):
+            # If a match exists, store it
+            self.captured = match.group(match.lastindex)
 
-                    # If a match exists, store it
-                    self.captured = match.group('lang')
+            # Set the values of the subtitle from the matched language.
+            lang = _NEEDLES[_GROUPS[match.lastindex - 1]][0]
+            self.code = lang.code
+            self.language = lang.primary_name
 
-                    # If we find a match, set the values of the subtitle, and break.
-                    self.code = lang.code
-                    self.language = lang.primary_name
+    @staticmethod
+    def is_subtitle(path: Union[str, Path, 'FilmPath']) -> bool:
+        """Returns True if the path has a subtitle extension.
 
-                    break
+        Args:
+            path (str, Path, or FilmPath): Path to check.
 
-            # Break from parent if captured is set.
-            if self.captured:
-                break
+        Returns:
+            bool: True if the path is a subtitle file.
+        """
+        return str(path).lower().endswith(_SUB_EXTS)
 
     def path_with_lang(self, path: Union[str, Path, 'FilmPath']) -> Path:
         """Returns a new path that includes the captured language string.
@@ -24,28 +24,48 @@ This module performs searches and handles results from TMDb.
     search: the main method exported by this module.
 """
 
-import re
+import time
 import asyncio
+from collections import OrderedDict
 from typing import List, Union
-from datetime import datetime
 import requests
 
 import tmdbsimple as tmdb
 from lazy import lazy
-from addict import Dict
 from pathlib import Path
-from itertools import groupby
 
 import fylmlib.config as config
-from . import Log
 from . import Compare
 from . import Format
 from . import patterns
-from .constants import *
 
 if config.tmdb.enabled:
     tmdb.API_KEY = config.tmdb.key
 
+# Maximum number of films to search at the same time.
+MAX_WORKERS = 50
+
+# One session is shared by all searches, so that connections to TMDb are kept
+# alive and reused, rather than opening a new connection for every request.
+# Its pool is sized to the number of searches that can run at the same time.
+SESSION = requests.Session()
+SESSION.mount('https://', requests.adapters.HTTPAdapter(pool_maxsize=MAX_WORKERS))
+tmdb.REQUESTS_SESSION = SESSION
+
+# Number of times to retry a request that TMDb rejected with 429 (Too Many
+# Requests), before giving up.
+MAX_RETRIES = 5
+
+# Longest time to wait before retrying, in seconds, no matter how long TMDb
+# asks for.
+MAX_RETRY_WAIT = 30
+
+# Raw TMDb results, keyed by query. Films in the same run often share
+# queries (e.g. the truncated titles of a series), so each is only sent once.
+# Only the most recently used CACHE_SIZE queries are kept.
+CACHE_SIZE = 1000
+CACHE = OrderedDict()
+
 class TMDb:
 
     class Result:
@@ -112,21 +132,20 @@ class TMDb:
                 self._merge(raw_result)
 
         def __repr__(self):
-            return f"Result" + str(tuple([str(x) for x in [
-                self.new_title or self.src_title,
-                self.new_year or self.src_year,
-                self.id] if x]))
+            title = self.new_title or self.src_title
+            year = self.new_year or self.src_year
+            return f"Result({', '.join(repr(str(x)) for x in (title, year, self.id) if x)})"
 
         def __eq__(self, other):
             """Use __eq__ method to define duplicate search results"""
-            return (self.new_title == other.new_title
-                    and self.new_year == other.new_year
-                    and self.id == self.id)
+            if not isinstance(other, TMDb.Result):
+                return NotImplemented
+            return (self.id == other.id
+                    and self.new_title == other.new_title
+                    and self.new_year == other.new_year)
 
         def __hash__(self):
-            return hash(('new_title', self.new_title,
-                         'new_year', self.new_year,
-                         'id', self.id))
+            return hash(self.id)
 
         def _merge(self, raw):
             """Map properties to this object from a raw JSON result.
@@ -137,22 +156,20 @@ class TMDb:
             Args:
                 raw: (Result) raw TMDb search result object
             """
-            raw = Dict(raw)
-
-            self.id = int(raw.id)
-            self.overview = raw.overview
-            self.poster_url = raw.poster_path
-            self.popularity = raw.popularity
-            self.vote_count = raw.vote_count
-            self.new_title = raw.title
-            if raw.title and raw.release_date:
+            self.id = int(raw['id'])
+            self.overview = raw.get('overview')
+            self.poster_url = raw.get('poster_path')
+            self.popularity = raw.get('popularity') or 0
+            self.vote_count = raw.get('vote_count') or 0
+            self.new_title = raw.get('title')
+            release_date = raw.get('release_date') or ''
+            if self.new_title and release_date:
                 # It's a valid API search result, so mark as valid
                 self.is_verified = True
-            try:
-                self.new_year = datetime.strptime(
-                    raw.release_date, "%Y-%m-%d").year
-            except:
-                self.new_year = 0
+            # Release dates are formatted YYYY-MM-DD, so the year is the first
+            # four chars. Missing or malformed dates get a year of 0.
+            release_year = release_date[:4]
+            self.new_year = int(release_year) if release_year.isdecimal() else 0
 
         @lazy
         def title_similarity(self) -> float:
@@ -194,26 +211,23 @@ class TMDb:
             # is used to determine an instant match.
             ideal_title_similarity = 0.85
 
+            # Check for an instant match: year match within max_year_diff (default
+            # 1 year off), high title similarity, and matching first letters. The
+            # year is a simple subtraction, so check it first, and only compare
+            # titles when it passes.
+            if self.year_deviation > config.tmdb.max_year_diff:
+                return False
+            if self.title_similarity < ideal_title_similarity:
+                return False
+
             # Check to see if the first letter of both titles match, otherwise we
             # might get some false positives when searching for shorter titles. E.g.
             # "Once" would still match "At Once" if title_similarity is set to 0.5,
             # but we can rule it out because the first chars don't match.
-            initial_chars_match = Compare.initial_chars_match(
+            return Compare.initial_chars_match(
                 Format.strip_the(self.src_title),
                 Format.strip_the(self.new_title), 1)
 
-            # Check for an instant match: high title similarity, year match within
-            # max_year_diff (default 1 year off), and is at most the second result.
-            # This limitation is imposed based on the theory that if by the second
-            # result is no good result is found, we should check for all potential
-            # results and find the best.
-            if (self.title_similarity >= ideal_title_similarity
-                and self.year_deviation <= config.tmdb.max_year_diff
-                    and initial_chars_match):
-                # Console.debug(f'Instant match: {self.new_title} ({self.new_year})')
-                return True
-            return False
-
         def update(self, film):
             """Updates a given film with the values of this result.
 
@@ -257,18 +271,18 @@ class TMDb:
 
             def __init__(self, *films):
                 loop = asyncio.get_event_loop()
-                tasks = asyncio.gather(*[
-                    asyncio.ensure_future(self._worker(
-                        i, film, min(len(films), 50)))
-                    for (i, film) in enumerate(films)
-                ])
-                loop.run_until_complete(tasks)
-
-            async def _worker(self, i, film, max_workers):
-                # semaphore limits num of simultaneous calls
-                async with asyncio.Semaphore(max_workers):
+                # A fixed number of workers take films from the same iterator,
+                # so at most MAX_WORKERS films are searched at the same time,
+                # and only that many tasks are created.
+                films_iter = iter(films)
+                loop.run_until_complete(asyncio.gather(*[
+                    self._worker(films_iter)
+                    for _ in range(min(len(films), MAX_WORKERS))
+                ]))
+
+            async def _worker(self, films):
+                for film in films:
                     await film.search_tmdb()
-                    return film
 
         class Q:
             """Search query dictionary handler
@@ -294,16 +308,19 @@ class TMDb:
 
             def __eq__(self, other):
                 """Use __eq__ method to define duplicate queries"""
-                return (self.query == other.query
-                        and self.primary_release_year == other.primary_release_year
-                        and self.year == self.year
-                        and self.id == self.id)
+                return self.key == other.key
 
             def __hash__(self):
-                return hash(('query', self.query,
-                             'primary_release_year', self.primary_release_year,
-                             'year', self.year,
-                             'id', self.id))
+                return hash(self.key)
+
+            @property
+            def key(self) -> tuple:
+                """The query's identity. TMDb searches are case insensitive,
+                so queries that only differ by case or whitespace are the same
+                search, and only need to be sent once."""
+                query = (' '.join(self.query.split()).lower()
+                         if isinstance(self.query, str) else self.query)
+                return (query, self.primary_release_year, self.year, self.id)
 
             def dict(self):
                 return self.__dict__
@@ -334,79 +351,121 @@ class TMDb:
             # Example API call:
             #    https://api.themoviedb.org/3/search/movie?year={year}&query={query}&api_key=KEY
 
-            queries = []
-            stripped = re.sub(patterns.STRIP_WHEN_SEARCHING, '', self.query)
-
-            queries = [
-                Q(query=self.query, year=self.year),
-                Q(query=stripped, year=self.year),
-                Q(query=self.query, primary_release_year=self.year),
-                Q(query=stripped, primary_release_year=self.year)
-            ]
-
-            # Try separating path parts
-            parts = Path(self.query).parts
-            if len(parts) > 1:
-                [queries.append(Q(query=p, primary_release_year=self.year))
-                 for p in parts]
-                [queries.append(Q(query=p)) for p in parts]
-
-            # Recursively remove the last word in the query
-            for i, _ in enumerate(stripped.split()):
-                q = stripped.rsplit(' ', i)[0]
-                queries.append(Q(query=q, primary_release_year=self.year))
-                queries.append(Q(query=q))
-
-            # Get an ordered list of unique queries
-            for i, q in enumerate(list(dict.fromkeys(queries))):
-                r = await self.dispatch_search(q)
-                for m in r:
+            # Results are aggregated as they arrive, counting the number of
+            # times each appeared in all searches. A result that an earlier
+            # query already returned has already been checked, so it is only
+            # counted again.
+            counts = {}
+
+            def instant_match(page: List['TMDb.Result']):
+                for m in page:
+                    if m in counts:
+                        counts[m] += 1
+                        continue
                     if m.is_instant_match:
+                        return m
+                    counts[m] = 1
+
+            # The first query is the most likely to find an instant match, so
+            # it is sent on its own, before any of the fallbacks are built.
+            first = Q(query=self.query, year=self.year)
+            m = instant_match(await self.dispatch_search(first))
+            if m:
+                return [m]
+
+            # If it doesn't find one, the unique fallbacks are sent
+            # concurrently, and their results are checked in the same order
+            # they would have been sent. As soon as one of them is an instant
+            # match, the rest are cancelled, so any that haven't been sent yet
+            # never are.
+            queries = [q for q in dict.fromkeys(self.fallback_queries())
+                       if q != first]
+            tasks = [asyncio.ensure_future(self.dispatch_search(q))
+                     for q in queries]
+            try:
+                for t in tasks:
+                    m = instant_match(await t)
+                    if m:
                         return [m]
-                self.results.extend(r)
-
-            # Sort, group/aggregate by ID, then sort by number of times the result appeared
-            # in all searches
-            results_sorted = sorted(self.results, key=lambda x: x.id)
-            aggregate_results = [(r, len(list(results)))
-                                 for r, results in groupby(results_sorted)]
-            aggregate_results.sort(key=lambda x: x[1], reverse=True)
+            finally:
+                for t in tasks:
+                    t.cancel()
 
             # If no instant match was found, we need to figure out which are the most likely
             # matches. Strip duplicate results and remove results that don't match the
             # configured match threshold:
-            filtered_results = list(filter(
-                lambda x:
-                    (x[0].year_deviation == 0
-                        and (x[0].vote_count + x[0].popularity) >= 100
-                        and x[0].title_similarity == config.tmdb.min_title_similarity / 1.4) or
-                    (int(x[0].year_deviation) <= config.tmdb.max_year_diff
-                        and x[0].popularity >= config.tmdb.min_popularity
-                        and x[0].title_similarity == config.tmdb.min_title_similarity) or
-                    (x[0].year_deviation <= 2
-                        and x[0].title_similarity >= 1.0) or
-                    (x[0].year_deviation <= 1
-                        and x[0].title_similarity >= 0.8) or
-                    (x[0].year_deviation == 0
-                        and x[0].title_similarity >= (config.tmdb.min_title_similarity / 1.5)),
-                # aggregate results is in a tuple: (Result, number_of_times_returned)
-                aggregate_results
-            ))
-
-            # Sort the results by:
-            #   - Sort by highest popularity rank first
+            # The thresholds are the same for every result, so look them up once.
+            min_similarity = config.tmdb.min_title_similarity
+            min_similarity_same_year = min_similarity / 1.5
+            max_year_diff = config.tmdb.max_year_diff
+            min_popularity = config.tmdb.min_popularity
+
+            def is_potential_match(r: 'TMDb.Result') -> bool:
+                # The most selective checks come first.
+                yd = r.year_deviation
+                ts = r.title_similarity
+                return ((yd <= 1 and ts >= 0.8)
+                        or (yd <= 2 and ts >= 1.0)
+                        or (yd == 0 and ts >= min_similarity_same_year)
+                        or (yd <= max_year_diff
+                            and r.popularity >= min_popularity
+                            and ts >= min_similarity))
+
+            # counts is a dict of {Result: number_of_times_returned}
+            filtered_results = [x for x in counts.items()
+                                if is_potential_match(x[0])]
+
+            def is_close_match(r: 'TMDb.Result') -> bool:
+                return r.year_deviation == 0 and r.title_similarity >= 0.8
+
+            # Sort the results, in a single pass over only the potential matches:
+            #   - Sort close matches (same year, similar title) first, so a
+            #     popular but different film can't outrank them
+            #   - Then by highest popularity rank
             #   - Then prefer a matching title similarity first (a 0.7 is better than a 0.4)
             #   - Then prefer lowest year deviation (0 is better than 1)
-            sorted_results = list(sorted(filtered_results,
-                                         key=lambda x: (-(x[0].vote_count + x[0].popularity), -
-                                                        x[0].title_similarity, x[0].year_deviation)
-                                         ))
+            #   - Then prefer results that appeared in the most searches
+            sorted_results = sorted(filtered_results,
+                                    key=lambda x: (not is_close_match(x[0]),
+                                                   -(x[0].vote_count + x[0].popularity),
+                                                   -x[0].title_similarity,
+                                                   x[0].year_deviation,
+                                                   -x[1]))
 
             # Return results (0 index) from the sorted and filtered tuple list
             self.results = [x[0] for x in sorted_results]
             # Console.debug(f"Slow '{self.query}' ({round(timer() - start)} second(s))")
             return self.results
 
+        def fallback_queries(self):
+            """Yields the queries to try if the original query and year don't
+            find an instant match, from most to least specific.
+
+            Yields:
+                Search.Q objects, which may repeat.
+            """
+            Q = Search.Q
+            stripped = patterns.STRIP_WHEN_SEARCHING.sub('', self.query)
+
+            yield Q(query=stripped, year=self.year)
+            yield Q(query=self.query, primary_release_year=self.year)
+            yield Q(query=stripped, primary_release_year=self.year)
+
+            # Try separating path parts
+            parts = Path(self.query).parts
+            if len(parts) > 1:
+                for p in parts:
+                    yield Q(query=p, primary_release_year=self.year)
+                for p in parts:
+                    yield Q(query=p)
+
+            # Recursively remove the last word in the query
+            words = stripped.split()
+            for i in range(len(words), 0, -1):
+                q = ' '.join(words[:i])
+                yield Q(query=q, primary_release_year=self.year)
+                yield Q(query=q)
+
         async def dispatch_search(self, q: 'Search.Q') -> List['Search.Result']:
             """TMDb lib search executor. Performs a TMDb search using the
             specified query params.
@@ -417,29 +476,78 @@ class TMDb:
             Returns:
                 A list of raw result dictionary objects mapped from TMDb JSON.
             """
-            # Disable the log
-            Log.disable()
-            # Instantiate a TMDb search object.
-            search = tmdb.Search()
-            # Build the search query and execute the search.
-            res = []
-            query = q.__dict__
-            query['include_adult'] = 'true'
-            if q.id:
+            res = CACHE.get(q.key)
+            if res is None:
+                # tmdbsimple blocks while it waits for a response, so run it in
+                # the loop's executor to let other searches run in the meantime.
+                loop = asyncio.get_running_loop()
                 try:
-                    r = tmdb.Movies(q.id).info()
-                    res = [r] if r else []
+                    res = await loop.run_in_executor(None, Search._search, q)
                 except requests.exceptions.HTTPError:
-                    res = []
+                    # An ID lookup that fails (because the ID doesn't exist,
+                    # or TMDb is unavailable) has no results. It isn't cached,
+                    # so that a later lookup can try again.
+                    if q.id:
+                        return []
+                    raise
+                CACHE[q.key] = res
+                if len(CACHE) > CACHE_SIZE:
+                    CACHE.popitem(last=False)
             else:
-                search.movie(**query)
-                res = search.results
-            # Re-enable the log
-            Log.enable()
+                CACHE.move_to_end(q.key)
             return [Result(src_title=self.query,
                            src_year=self.year,
                            raw_result=r) for r in res]
 
+        @staticmethod
+        def _search(q: 'Search.Q') -> List[dict]:
+            """Performs a blocking TMDb search using the specified query params.
+
+            Args:
+                Q (Search.Q): Dictionary of kwargs to pass to TMDb searcher
+
+            Returns:
+                A list of raw result dictionaries from TMDb JSON.
+            """
+            attempt = 0
+            while True:
+                try:
+                    if q.id:
+                        r = Search._keep_alive(tmdb.Movies(q.id)).info()
+                        return [r] if r else []
+
+                    # Instantiate a TMDb search object, then build the search
+                    # query (without modifying q, which is also used to dedupe
+                    # queries) and execute the search.
+                    search = Search._keep_alive(tmdb.Search())
+                    search.movie(**q.dict(), include_adult='true')
+                    return search.results
+                except requests.exceptions.HTTPError as e:
+                    # If we're being rate limited, wait as long as TMDb asks
+                    # (or back off exponentially), up to MAX_RETRY_WAIT, then
+                    # try again. This runs in an executor thread, so it
+                    # doesn't block other searches.
+                    if (e.response is not None
+                            and e.response.status_code == 429
+                            and attempt < MAX_RETRIES):
+                        try:
+                            wait = float(e.response.headers.get('Retry-After'))
+                        except (TypeError, ValueError):
+                            wait = 2 ** attempt
+                        time.sleep(max(0, min(wait, MAX_RETRY_WAIT)))
+                        attempt += 1
+                        continue
+                    raise
+
+
+        @staticmethod
+        def _keep_alive(obj):
+            """tmdbsimple sends 'Connection: close' with every request, which
+            would stop the shared session from reusing its connections, so
+            remove it from the TMDb object's headers."""
+            obj.headers.pop('Connection', None)
+            return obj
+
 
 Result = TMDb.Result
 Search = TMDb.Search
@@ -25,6 +25,7 @@ import itertools
 import logging
 from pathlib import Path
 from datetime import timedelta
+from collections import OrderedDict
 
 # Add the cwd to the path so we can load fylmlib modules and fylm app.
 sys.path.append(str(Path().cwd().parent / 'fylm'))
@@ -120,6 +121,22 @@ def setup():
         config.debug = True if os.environ.get('DEBUG').lower() == 'true' else False
     logging.getLogger().setLevel(logging.DEBUG if config.debug else logging.CRITICAL)
     
+@pytest.fixture
+def stub_tmdb(monkeypatch):
+    """Returns a function that replaces TMDb searches with results_fn, which
+    is called with each Search.Q and returns a list of raw results, so that
+    searches run offline. The TMDb cache is emptied, so that every query is
+    passed to results_fn."""
+
+    from fylmlib import TMDb
+    import fylmlib.tmdb as tmdb
+
+    def stub(results_fn):
+        monkeypatch.setattr(TMDb.Search, '_search', staticmethod(results_fn))
+        monkeypatch.setattr(tmdb, 'CACHE', OrderedDict())
+
+    return stub
+
 def remake_files():
     
     cleanup_all()
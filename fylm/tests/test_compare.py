@@ -58,6 +58,11 @@ _SD_WEB = Film(SRC / RND / ROGUE / f'{ROGUE}.WEB-DL.xvid-group.avi')
 _SD_HDTV = Film(SRC / RND / ROGUE / f'{ROGUE}.HDTV.xvid-group.avi')
 
 class TestCompare:
+
+    def test_title_similarity(self):
+        assert(Compare.normalize_title('The Last Jedi!') == 'last jedi')
+        assert(Compare.title_similarity('The Last Jedi', 'last  jedi') == 1.0)
+        assert(Compare.title_similarity('Rogue One', None) == 0.0)
     
     def test_4KHDR_vs_4k(self): 
         left = Make.mock_file(_4KHDR).main_file
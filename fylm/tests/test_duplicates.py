@@ -466,6 +466,18 @@ class TestDuplicates(object):
     def test_different_media(self):
         pass
 
+    def test_duplicates_disabled(self):
+
+        src = new(NEW_AQUA, '1080p')
+        Make.mock_files(src, moved(MOVED_AQUA, '720p'))
+
+        assert(len(Film(src).duplicates) == 1)
+
+        # When duplicate checking is disabled, dst dirs aren't searched.
+        config.duplicates.enabled = False
+        assert(len(Film(src).duplicates) == 0)
+        assert(Film(src).duplicates.files == [])
+
 class TestDuplicatesMap:
 
     @pytest.mark.skip(reason="Not implemented")
@@ -69,6 +69,19 @@ class TestSubtitle:
         assert sub5.code == 'fr'
         assert sub5.language == 'French'
     
+    def test_sub_init_str_path(self):
+
+        sub = Subtitle(str(NEW_SUB4))
+        assert sub.captured == 'English'
+        assert sub.code == 'en'
+
+    def test_is_subtitle(self):
+
+        assert Subtitle.is_subtitle(NEW_SUB1)
+        assert Subtitle.is_subtitle(str(NEW_SUB6).upper())
+        assert not Subtitle.is_subtitle(SRC / NEW_ROGUE / f'{NEW_ROGUE}.mkv')
+        assert not Subtitle.is_subtitle(SRC / NEW_ROGUE / 'srt')
+
     def test_path_with_lang(self):
         
         sub = Subtitle(NEW_SUB1)
@@ -84,6 +97,8 @@ class TestSubtitle:
     def test_path_no_lang(self):
         
         sub = Subtitle(NEW_SUB6)
+        assert sub.captured is None
+        assert sub.code is None
         assert sub.path_with_lang(Path(f'{MOVED_ROGUE}.srt')) == Path(f'{MOVED_ROGUE}.srt')
         
     def test_move_film_with_subs(self):
@@ -19,8 +19,13 @@
 
 import re
 import os
+import asyncio
+import threading
+from types import SimpleNamespace
 from pathlib import Path
 
+import requests
+
 import pytest
 
 import fylmlib.config as config
@@ -262,6 +267,131 @@ class TestFilm(object):
 
         assert(type(Film(SRC / JEDI).tmdb).__name__ == 'Result')
         assert(not Film(SRC / JEDI).tmdb.id)
+
+    def test_tmdb_result_eq(self):
+
+        raw = {'id': 330459, 'title': 'Rogue One', 'release_date': '2016-12-14'}
+        a = TMDb.Result(raw_result=raw)
+        b = TMDb.Result(raw_result=raw)
+        c = TMDb.Result(raw_result={**raw, 'id': 1})
+        assert(a.new_year == 2016)
+        assert(TMDb.Result(raw_result={**raw, 'release_date': ''}).new_year == 0)
+        assert(a == b)
+        assert(a != c)
+        assert(len({a, b, c}) == 2)
+        
+    def test_tmdb_search_potential_matches(self, stub_tmdb):
+
+        # None of these are instant matches, so all of them are filtered
+        # and sorted as potential matches.
+        raw = [
+            # Same year and similar, but unpopular
+            {'id': 1, 'title': 'Rival', 'release_date': '2016-01-01',
+             'popularity': 2, 'vote_count': 10},
+            # A year off and less similar, but popular
+            {'id': 2, 'title': 'Survival', 'release_date': '2017-01-01',
+             'popularity': 500, 'vote_count': 9000},
+            # A year off, less similar, and unpopular
+            {'id': 3, 'title': 'Festival', 'release_date': '2015-01-01',
+             'popularity': 0.1, 'vote_count': 1},
+            # Popular, but too many years off
+            {'id': 4, 'title': 'Revival', 'release_date': '1990-01-01',
+             'popularity': 900, 'vote_count': 20000}]
+        stub_tmdb(lambda q: raw)
+
+        loop = asyncio.get_event_loop()
+        results = loop.run_until_complete(TMDb.Search('Arrival', 2016).do())
+        assert([r.id for r in results] == [1, 2])
+        
+    def test_tmdb_search_cache(self, stub_tmdb, monkeypatch):
+
+        raw = {'id': 330459, 'title': 'Rogue One', 'release_date': '2016-12-14'}
+        calls = []
+        def search(q):
+            calls.append(q)
+            # The first ID lookup fails, e.g. because TMDb is unavailable.
+            if q.id and len(calls) == 1:
+                raise requests.exceptions.HTTPError('503 Server Error')
+            return [raw]
+        stub_tmdb(search)
+        monkeypatch.setattr(tmdb, 'CACHE_SIZE', 2)
+
+        loop = asyncio.get_event_loop()
+        lookup = lambda **kw: loop.run_until_complete(TMDb.Search(**kw).do())
+
+        # A failed lookup isn't cached, so it's sent again.
+        assert(lookup(query='Rogue One', id=330459) == [])
+        assert([r.id for r in lookup(query='Rogue One', id=330459)] == [330459])
+        assert([r.id for r in lookup(query='Rogue One', id=330459)] == [330459])
+        assert(len(calls) == 2)
+
+        # Only the most recently used queries are kept.
+        lookup(query='Rogue One', id=1)
+        lookup(query='Rogue One', id=2)
+        assert(len(tmdb.CACHE) == 2)
+        lookup(query='Rogue One', id=330459)
+        assert(len(calls) == 5)
+        
+    def test_tmdb_search_stops_at_instant_match(self, stub_tmdb):
+
+        raw = {'id': 330459, 'title': 'Rogue One', 'release_date': '2016-12-14'}
+        released = threading.Event()
+        finished = []
+        def search(q):
+            # The first fallback finds an instant match.
+            if q.primary_release_year == 2016 and q.query == 'Rogue One':
+                return [raw]
+            if q.year == 2016:
+                return []
+            # The other fallbacks don't return until they're released (or
+            # time out, if do() is waiting for them).
+            released.wait(5)
+            finished.append(q)
+            return []
+        stub_tmdb(search)
+
+        loop = asyncio.get_event_loop()
+        try:
+            results = loop.run_until_complete(
+                TMDb.Search('Rogue One', 2016).do())
+            # do() returned without waiting for any of the other fallbacks.
+            assert(finished == [])
+        finally:
+            released.set()
+        assert([r.id for r in results] == [330459])
+        
+    def test_tmdb_search_retry(self, monkeypatch):
+
+        def too_many_requests(retry_after=None):
+            r = requests.Response()
+            r.status_code = 429
+            if retry_after:
+                r.headers['Retry-After'] = retry_after
+            return requests.exceptions.HTTPError(response=r)
+
+        # TMDb asks for an unreasonably long wait, then gives no wait, then
+        # returns results.
+        responses = [too_many_requests('86400'), too_many_requests(), 'ok']
+        class Search:
+            headers = {}
+            def movie(self, **kwargs):
+                r = responses.pop(0)
+                if r != 'ok':
+                    raise r
+                self.results = [{'id': 1}]
+        waits = []
+        monkeypatch.setattr(tmdb.tmdb, 'Search', Search)
+        # Only tmdb's sleep is replaced, not the time module's.
+        monkeypatch.setattr(tmdb, 'time', SimpleNamespace(sleep=waits.append))
+
+        assert(TMDb.Search._search(TMDb.Search.Q(query='x')) == [{'id': 1}])
+        # The long wait is clamped, the missing one backs off exponentially.
+        assert(waits == [tmdb.MAX_RETRY_WAIT, 2])
+
+        # After MAX_RETRIES, the error is raised.
+        responses[:] = [too_many_requests()] * (tmdb.MAX_RETRIES + 1)
+        with pytest.raises(requests.exceptions.HTTPError):
+            TMDb.Search._search(TMDb.Search.Q(query='x'))
         
     def test_wanted_files(self):
         rogue = Film(SRC / ROGUE)
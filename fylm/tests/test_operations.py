@@ -17,6 +17,7 @@
 # Where a conflict or dispute would arise between these two licenses, HLv2.1
 # shall take precedence.
 
+import errno
 import os
 import sys
 from timeit import default_timer as timer
@@ -649,13 +650,20 @@ class TestIO(object):
         assert(src.exists())
         assert(not dst.exists())
         
-        IO.move(src, dst)
+        # Only copies are staged as .partial~, same partition moves are
+        # a single rename.
+        always_copy = config.always_copy
+        config.always_copy = True
+        try:
+            IO.move(src, dst)
+        finally:
+            config.always_copy = always_copy
+            observer.stop()
         assert(event_handler.exists)
         
         assert(not src.exists())
         assert(dst.exists())
-        
-        observer.stop()
+        assert(not partial.exists())
     
     @pytest.mark.skip(reason="Not supported in CI")
     def test_move_check_for_dup(self):
@@ -686,21 +694,47 @@ class TestIO(object):
     
     def test_move_copy(self):
         
-        config.always_copy = True
-        assert(config.always_copy)
-        
         src = FilmPath(SRC / ALITA / f'{ALITA}.mkv')
         dst = FilmPath(SRC / ALITA_DST)
 
-        Make.mock_file(src)
-
+        Make.mock_file(src, 10 * KB)
         
         assert(src.exists())
         assert(not dst.exists())
+        always_copy = config.always_copy
+        config.always_copy = True
+        try:
+            with contextlib.redirect_stdout(None):
+                assert(IO.move(src, dst))
+        finally:
+            config.always_copy = always_copy
+        assert(not src.exists())
+        assert(dst.exists())
+        assert(dst.stat().st_size == 10 * KB)
+        assert(not Path(f'{dst}.partial~').exists())
+    
+    def test_move_copy_when_rename_crosses_devices(self, monkeypatch):
+
+        src = FilmPath(SRC / ALITA / f'{ALITA}.mkv')
+        dst = FilmPath(SRC / ALITA_DST)
+
+        Make.mock_file(src, 10 * KB)
+
+        # Simulate a mount that shares a device id but can't be renamed
+        # across, e.g. a bind or overlay mount.
+        rename = os.rename
+        def cross_device_rename(a, b, *args, **kwargs):
+            if (Path(a), Path(b)) == (src, dst):
+                raise OSError(errno.EXDEV, os.strerror(errno.EXDEV))
+            return rename(a, b, *args, **kwargs)
+        monkeypatch.setattr(os, 'rename', cross_device_rename)
+
+        assert(not config.always_copy)
         with contextlib.redirect_stdout(None):
-            IO.move(src, dst)
+            assert(IO.move(src, dst))
         assert(not src.exists())
         assert(dst.exists())
+        assert(dst.stat().st_size == 10 * KB)
     
     def test_move(self):
         
@@ -824,6 +858,50 @@ class TestSize(object):
         # Test multiple files in dir to diff of 3 bytes
         assert(abs(Size(SRC).value - sum(s for (_, s) in files) == 0))
     
+    def test_scan(self):
+
+        files = [
+            (SRC / 'Test.Dir/Test.File.mkv', 21 * MB),
+            (SRC / 'Test.Dir/Nested/Test.File.avi', 2 * MB),
+            (SRC / 'Test.Dir/Nested/Test.File.jpg', 15 * KB)
+        ]
+
+        for f in files:
+            Make.mock_file(f[0], f[1])
+        Make.mock_file(SRC / 'Test.Dir/.DS_Store', 1)
+
+        (count, size) = Size.scan(SRC / 'Test.Dir')
+
+        # Three files and one dir; system files are excluded from the
+        # count, but still take up space.
+        assert(count == 4)
+        assert(size == sum(s for (_, s) in files) + 1)
+
+    def test_scan_unreadable_dir(self, monkeypatch):
+
+        files = [
+            (SRC / 'Test.Dir/Test.File.mkv', 21 * MB),
+            (SRC / 'Test.Dir/Nested/Test.File.avi', 2 * MB)
+        ]
+
+        for f in files:
+            Make.mock_file(f[0], f[1])
+
+        # Permissions aren't enforced for every user (e.g. root), so
+        # simulate a dir that can't be read.
+        scandir = os.scandir
+        def unreadable(path):
+            if Path(path) == SRC / 'Test.Dir/Nested':
+                raise PermissionError(13, 'Permission denied', str(path))
+            return scandir(path)
+        monkeypatch.setattr(os, 'scandir', unreadable)
+
+        (count, size) = Size.scan(SRC / 'Test.Dir')
+
+        # The unreadable dir is counted, but its contents are skipped.
+        assert(count == 2)
+        assert(size == 21 * MB)
+
     @pytest.mark.xfail(raises=AttributeError)
     def test_not_init(self):
 